@@ -1,11 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import or_
 from sqlalchemy.orm import Session
+from typing import Optional
 
 from services.auth import hash_password, verify_password, create_access_token, get_current_user_id
 from schemas.user import UserCreate, UserLogin, UserWithToken, UserOut
 from schemas.token import Token
+from services.idempotency import idempotency_store, get_idempotency_key
 
+from core.config import settings
 from database.database import get_db
 
 from database.models.user import User
@@ -14,34 +17,49 @@ from database.models.user import User
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
-@router.post("/register", response_model=UserWithToken)
-def register(user: UserCreate, db: Session = Depends(get_db)):
-    # Check if username or email already exists (single query)
-    existing_user = db.query(User).filter(
-        or_(User.username == user.username, User.email == user.email)
-    ).first()
-
-    if existing_user:
-        # Determine which field conflicts
-        if existing_user.username == user.username:
-            raise HTTPException(status_code=400, detail="Username already exists")
-        else:
-            raise HTTPException(status_code=400, detail="Email already exists")
-
-    hashed_password = hash_password(user.password)
-    new_user = User(username=user.username, email=user.email, hashed_password=hashed_password)
-
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+# A replayed register response carries the token issued by the original request,
+# so keep it well inside the token's lifetime
+REGISTER_IDEMPOTENCY_TTL_SECONDS = 5 * 60
 
-    access_token = create_access_token(data={"sub": str(new_user.id)})
-
-    user_out = UserOut.model_validate(new_user)
-    token = Token(access_token=access_token, token_type="bearer")
-    response = UserWithToken(user=user_out, token=token)
-
-    return response
+@router.post("/register", response_model=UserWithToken)
+def register(
+    user: UserCreate,
+    db: Session = Depends(get_db),
+    idempotency_key: Optional[str] = Depends(get_idempotency_key)
+):
+    def write() -> UserWithToken:
+        # Check if username or email already exists (single query)
+        existing_user = db.query(User).filter(
+            or_(User.username == user.username, User.email == user.email)
+        ).first()
+
+        if existing_user:
+            # Determine which field conflicts
+            if existing_user.username == user.username:
+                raise HTTPException(status_code=400, detail="Username already exists")
+            else:
+                raise HTTPException(status_code=400, detail="Email already exists")
+
+        hashed_password = hash_password(user.password)
+        new_user = User(username=user.username, email=user.email, hashed_password=hashed_password)
+
+        db.add(new_user)
+        db.commit()
+        db.refresh(new_user)
+
+        access_token = create_access_token(data={"sub": str(new_user.id)})
+
+        user_out = UserOut.model_validate(new_user)
+        token = Token(access_token=access_token, token_type="bearer")
+        response = UserWithToken(user=user_out, token=token)
+
+        return response
+
+    # Unauthenticated, so keys are scoped by the username being registered
+    return idempotency_store.run(
+        idempotency_key, f"register:{user.username}", "POST /auth/register", user, write,
+        ttl_seconds=min(REGISTER_IDEMPOTENCY_TTL_SECONDS, settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60 / 2)
+    )
 
 @router.post("/token", response_model=Token)
 def token(user: UserLogin, db: Session = Depends(get_db)):
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from services.auth import get_current_user_id
 from services.comment import (
@@ -8,8 +8,10 @@ from services.comment import (
     verify_comment_ownership,
     comment_to_schema
 )
+from services.comment_cache import comment_page_cache
+from services.idempotency import idempotency_store, get_idempotency_key
 from schemas.comment import ReplyCreate, CommentUpdate, CommentOut
-from database.database import get_db
+from database.database import get_db, get_read_db
 from database.models.comment import Comment
 
 
@@ -20,33 +22,41 @@ def create_reply(
     comment_id: int,
     reply: ReplyCreate,
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    idempotency_key: Optional[str] = Depends(get_idempotency_key)
 ):
     """
     Create a reply to a comment.
     Requires authentication via Bearer token.
+    Retries sent with the same Idempotency-Key header replay the original response.
     """
-    # Verify the parent comment exists
-    parent_comment = get_comment_or_404(db, comment_id)
-
-    new_reply = Comment(
-        content=reply.content,
-        post_id=parent_comment.post_id,
-        parent_id=comment_id,
-        owner_id=user_id
+    def write() -> CommentOut:
+        # Verify the parent comment exists
+        parent_comment = get_comment_or_404(db, comment_id)
+
+        new_reply = Comment(
+            content=reply.content,
+            post_id=parent_comment.post_id,
+            parent_id=comment_id,
+            owner_id=user_id
+        )
+
+        db.add(new_reply)
+        db.commit()
+        db.refresh(new_reply)
+        comment_page_cache.add(new_reply)
+
+        return comment_to_schema(new_reply)
+
+    return idempotency_store.run(
+        idempotency_key, f"user:{user_id}", f"POST /comments/{comment_id}/replies", reply, write
     )
 
-    db.add(new_reply)
-    db.commit()
-    db.refresh(new_reply)
-
-    return comment_to_schema(new_reply)
-
 @router.get("/", response_model=List[CommentOut])
 def get_comments(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get all comments with pagination.
@@ -60,7 +70,7 @@ def get_comments_by_user(
     user_id: int,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get all comments by a specific user with pagination.
@@ -70,7 +80,7 @@ def get_comments_by_user(
     return [comment_to_schema(comment) for comment in comments]
 
 @router.get("/{comment_id}", response_model=CommentOut)
-def get_comment(comment_id: int, db: Session = Depends(get_db)):
+def get_comment(comment_id: int, db: Session = Depends(get_read_db)):
     """
     Get a single comment by ID.
     No authentication required.
@@ -79,7 +89,7 @@ def get_comment(comment_id: int, db: Session = Depends(get_db)):
     return comment_to_schema(comment)
 
 @router.get("/{comment_id}/replies", response_model=CommentOut)
-def get_comment_with_replies(comment_id: int, db: Session = Depends(get_db)):
+def get_comment_with_replies(comment_id: int, db: Session = Depends(get_read_db)):
     """
     Get a comment with a shallow tree of replies (exactly 1 layer deep).
     No authentication required.
@@ -116,6 +126,7 @@ def update_comment(
 
     db.commit()
     db.refresh(comment)
+    comment_page_cache.add(comment)
 
     return comment_to_schema(comment)
 
@@ -133,7 +144,10 @@ def delete_comment(
     comment = get_comment_or_404(db, comment_id)
     verify_comment_ownership(comment, user_id)
 
+    post_id = comment.post_id
     db.delete(comment)
     db.commit()
+    # Cascaded replies are removed too, so drop the whole post entry
+    comment_page_cache.invalidate(post_id)
 
     return None
\ No newline at end of file
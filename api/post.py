@@ -1,46 +1,55 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from services.auth import get_current_user_id
 from services.post import get_post_or_404, verify_post_ownership, post_to_schema
 from schemas.post import PostCreate, PostUpdate, PostOut
 from schemas.comment import CommentCreate, CommentOut
-from database.database import get_db
+from database.database import get_db, get_read_db
 from database.models.post import Post
 from database.models.comment import Comment
 from services.comment import comment_to_schema
+from services.comment_cache import comment_page_cache, load_post_comments, record_to_schema
+from services.idempotency import idempotency_store, get_idempotency_key
 
 
 router = APIRouter(prefix="/posts", tags=["posts"])
 
+COMMENT_PAGE_MAX_LIMIT = 100
+
 @router.post("/", response_model=PostOut)
 def create_post(
     post: PostCreate,
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    idempotency_key: Optional[str] = Depends(get_idempotency_key)
 ):
     """
     Create a new post.
     Requires authentication via Bearer token.
+    Retries sent with the same Idempotency-Key header replay the original response.
     """
-    new_post = Post(
-        title=post.title,
-        content=post.content,
-        owner_id=user_id
-    )
+    def write() -> PostOut:
+        new_post = Post(
+            title=post.title,
+            content=post.content,
+            owner_id=user_id
+        )
 
-    db.add(new_post)
-    db.commit()
-    db.refresh(new_post)
+        db.add(new_post)
+        db.commit()
+        db.refresh(new_post)
+
+        return post_to_schema(new_post)
 
-    return post_to_schema(new_post)
+    return idempotency_store.run(idempotency_key, f"user:{user_id}", "POST /posts/", post, write)
 
 @router.get("/", response_model=List[PostOut])
 def get_posts(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get all posts with pagination.
@@ -54,7 +63,7 @@ def get_posts_by_user(
     user_id: int,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get all posts by a specific user with pagination.
@@ -64,7 +73,7 @@ def get_posts_by_user(
     return [post_to_schema(post) for post in posts]
 
 @router.get("/{post_id}", response_model=PostOut)
-def get_post(post_id: int, db: Session = Depends(get_db)):
+def get_post(post_id: int, db: Session = Depends(get_read_db)):
     """
     Get a single post by ID.
     No authentication required.
@@ -102,27 +111,57 @@ def create_comment(
     post_id: int,
     comment: CommentCreate,
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    idempotency_key: Optional[str] = Depends(get_idempotency_key)
 ):
     """
     Create a top-level comment on a post.
     Requires authentication via Bearer token.
+    Retries sent with the same Idempotency-Key header replay the original response.
     """
-    # Verify the post exists
-    post = get_post_or_404(db, post_id)
-
-    new_comment = Comment(
-        content=comment.content,
-        post_id=post_id,
-        parent_id=None,
-        owner_id=user_id
+    def write() -> CommentOut:
+        # Verify the post exists
+        get_post_or_404(db, post_id)
+
+        new_comment = Comment(
+            content=comment.content,
+            post_id=post_id,
+            parent_id=None,
+            owner_id=user_id
+        )
+
+        db.add(new_comment)
+        db.commit()
+        db.refresh(new_comment)
+        comment_page_cache.add(new_comment)
+
+        return comment_to_schema(new_comment)
+
+    return idempotency_store.run(
+        idempotency_key, f"user:{user_id}", f"POST /posts/{post_id}/comments", comment, write
     )
 
-    db.add(new_comment)
-    db.commit()
-    db.refresh(new_comment)
+@router.get("/{post_id}/comments", response_model=List[CommentOut])
+def get_post_comments(
+    post_id: int,
+    after: Optional[int] = None,
+    limit: int = Query(100, ge=1, le=COMMENT_PAGE_MAX_LIMIT),
+    db: Session = Depends(get_db)
+):
+    """
+    Get all comments on a post (including replies), ordered by ID.
+    Uses keyset pagination: pass the last ID of the previous page as `after`.
+    Served from an in-memory per-post cache. Cache misses load from the primary,
+    since a lagging replica snapshot would hide recent comments until the entry expires.
+    No authentication required.
+    """
+    def load():
+        # Verify the post exists
+        get_post_or_404(db, post_id)
+        return load_post_comments(db, post_id)
 
-    return comment_to_schema(new_comment)
+    records = comment_page_cache.page(post_id, after, limit, load)
+    return [record_to_schema(record, post_id) for record in records]
 
 @router.delete("/{post_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_post(
@@ -139,5 +178,6 @@ def delete_post(
 
     db.delete(post)
     db.commit()
+    comment_page_cache.invalidate(post_id)
 
     return None
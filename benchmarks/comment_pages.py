@@ -0,0 +1,107 @@
+"""
+Benchmark paging through a post's comments from the in-memory cache vs the database.
+
+Run from the repository root against the configured DATABASE_URL:
+
+    python -m benchmarks.comment_pages --comments 5000 --page-size 50 --rounds 20
+
+Seed rows use a unique username and email and are written inside a transaction that
+is rolled back at the end. Tables must already exist; pass --create-tables to create
+them first.
+"""
+import argparse
+import time
+import uuid
+
+from database.database import Base, SessionLocal, engine
+from database.models import User, Post, Comment
+from services.comment_cache import CommentPageCache, CommentRecord, load_post_comments, record_to_schema
+
+
+def seed(db, comment_count: int) -> int:
+    suffix = uuid.uuid4().hex[:12]
+    user = User(username=f"bench_{suffix}", email=f"bench_{suffix}@example.com", hashed_password="x")
+    db.add(user)
+    db.flush()
+    post = Post(title="bench", content="bench", owner_id=user.id)
+    db.add(post)
+    db.flush()
+    db.add_all(
+        Comment(content=f"comment {i} " + "x" * 80, owner_id=user.id, post_id=post.id)
+        for i in range(comment_count)
+    )
+    db.flush()
+    return post.id
+
+
+def page_from_db(db, post_id: int, after, limit: int):
+    """
+    One keyset query per page, selecting the same columns as load_post_comments.
+    """
+    query = db.query(
+        Comment.id,
+        Comment.content,
+        Comment.owner_id,
+        Comment.parent_id,
+        Comment.created_at
+    ).filter(Comment.post_id == post_id)
+    if after is not None:
+        query = query.filter(Comment.id > after)
+    rows = query.order_by(Comment.id).limit(limit).all()
+    return [record_to_schema(CommentRecord(*row), post_id) for row in rows]
+
+
+def page_from_cache(cache: CommentPageCache, db, post_id: int, after, limit: int):
+    records = cache.page(post_id, after, limit, lambda: load_post_comments(db, post_id))
+    return [record_to_schema(record, post_id) for record in records]
+
+
+def walk(fetch, rounds: int) -> tuple[float, int]:
+    """
+    Page through every comment rounds times; return elapsed seconds and pages fetched.
+    """
+    pages = 0
+    start = time.perf_counter()
+    for _ in range(rounds):
+        after = None
+        while True:
+            page = fetch(after)
+            if not page:
+                break
+            pages += 1
+            after = page[-1].id
+    return time.perf_counter() - start, pages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--comments", type=int, default=5000)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--create-tables", action="store_true", help="Run create_all before seeding")
+    args = parser.parse_args()
+
+    if args.create_tables:
+        Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        post_id = seed(db, args.comments)
+        cache = CommentPageCache(max_bytes=1 << 30, ttl_seconds=float("inf"))
+
+        db_seconds, pages = walk(lambda after: page_from_db(db, post_id, after, args.page_size), args.rounds)
+        cache_seconds, _ = walk(
+            lambda after: page_from_cache(cache, db, post_id, after, args.page_size), args.rounds
+        )
+
+        stats = cache.stats()
+        print(f"comments: {args.comments}, page size: {args.page_size}, pages: {pages}")
+        print(f"database: {db_seconds:.3f}s ({db_seconds / pages * 1e6:.0f} us/page)")
+        print(f"cache:    {cache_seconds:.3f}s ({cache_seconds / pages * 1e6:.0f} us/page, first load included)")
+        print(f"cache memory: {stats['bytes']} bytes, {stats['bytes_per_comment']:.0f} bytes/comment")
+    finally:
+        db.rollback()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
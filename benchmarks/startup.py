@@ -0,0 +1,138 @@
+"""
+Startup profiling for the API.
+
+Run from the repository root:
+
+    python -m benchmarks.startup imports [--module main] [--top 20] [--app-dir DIR]
+    python -m benchmarks.startup first-request [--runs 5] [--path /openapi.json] [--app-dir DIR]
+
+"imports" runs `python -X importtime -c "import <module>"` and reports the slowest
+modules and the total self time per top-level package.
+"first-request" starts a uvicorn worker and measures the time from process start
+until it answers its first HTTP request.
+--app-dir points either command at another checkout, e.g. a `git worktree` of an
+older commit, to compare before and after a change.
+
+Importing main connects to DATABASE_URL to create tables, so both commands need a
+reachable database.
+"""
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, int]]:
+    """
+    Parse `-X importtime` output into (module, self_us, cumulative_us) rows.
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # Header line
+        rows.append((fields[2].strip(), int(fields[0]), int(fields[1])))
+    return rows
+
+
+def report_imports(module: str, top: int, app_dir: str) -> None:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        cwd=app_dir,
+    )
+    if result.returncode != 0:
+        sys.exit(result.stderr)
+    rows = parse_importtime(result.stderr)
+
+    by_package = defaultdict(int)
+    for name, self_us, _ in rows:
+        by_package[name.split(".")[0]] += self_us
+    total_us = sum(by_package.values())
+
+    print(f"import {module}: {total_us / 1000:.1f} ms across {len(rows)} modules\n")
+    print(f"{'package':<32}{'self ms':>10}{'share':>8}")
+    for package, self_us in sorted(by_package.items(), key=lambda item: -item[1])[:top]:
+        print(f"{package:<32}{self_us / 1000:>10.1f}{self_us / total_us:>8.1%}")
+
+    print(f"\n{'module':<48}{'cumulative ms':>14}")
+    for name, _, cumulative_us in sorted(rows, key=lambda row: -row[2])[:top]:
+        print(f"{name:<48}{cumulative_us / 1000:>14.1f}")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def time_to_first_request(path: str, timeout: float, app_dir: str) -> float:
+    """
+    Start one uvicorn worker and return seconds until path responds.
+    """
+    port = free_port()
+    url = f"http://127.0.0.1:{port}{path}"
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        env=os.environ.copy(),
+        cwd=app_dir,
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            if process.poll() is not None:
+                sys.exit(f"uvicorn exited with code {process.returncode}")
+            try:
+                with urllib.request.urlopen(url, timeout=1):
+                    return time.perf_counter() - start
+            except urllib.error.HTTPError:
+                # Any HTTP response, even an error status, means the worker is serving
+                return time.perf_counter() - start
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.01)
+        sys.exit(f"No response from {url} within {timeout}s")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def report_first_request(path: str, runs: int, timeout: float, app_dir: str) -> None:
+    timings = [time_to_first_request(path, timeout, app_dir) for _ in range(runs)]
+    for run, seconds in enumerate(timings, start=1):
+        print(f"run {run}: {seconds * 1000:.0f} ms")
+    timings.sort()
+    print(f"min {timings[0] * 1000:.0f} ms, median {timings[len(timings) // 2] * 1000:.0f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    imports = subparsers.add_parser("imports", help="Report import time by module and package")
+    imports.add_argument("--module", default="main")
+    imports.add_argument("--top", type=int, default=20)
+    imports.add_argument("--app-dir", default=".")
+
+    first_request = subparsers.add_parser("first-request", help="Measure worker time-to-first-request")
+    first_request.add_argument("--path", default="/openapi.json")
+    first_request.add_argument("--runs", type=int, default=5)
+    first_request.add_argument("--timeout", type=float, default=30.0)
+    first_request.add_argument("--app-dir", default=".")
+
+    args = parser.parse_args()
+    if args.command == "imports":
+        report_imports(args.module, args.top, args.app_dir)
+    else:
+        report_first_request(args.path, args.runs, args.timeout, args.app_dir)
+
+
+if __name__ == "__main__":
+    main()
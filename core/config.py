@@ -1,15 +1,44 @@
-from pydantic_settings import BaseSettings
-from pydantic import ConfigDict
+from typing import Annotated, List, Literal
+from pydantic_settings import BaseSettings, NoDecode
+from pydantic import ConfigDict, field_validator, model_validator
 
 class Settings(BaseSettings):
     DATABASE_URL: str
+    # Comma-separated read replica URLs; reads fall back to DATABASE_URL when empty
+    READ_REPLICA_URLS: Annotated[List[str], NoDecode] = []
+    REPLICA_MAX_LAG_SECONDS: float = 5.0
+    REPLICA_HEALTH_CHECK_INTERVAL_SECONDS: float = 10.0
+    REPLICA_CONNECT_TIMEOUT_SECONDS: int = 2
+    READ_YOUR_WRITES_SECONDS: float = 5.0
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # "jose" (python-jose) or "hs256" (standard library, HS256 only, no asymmetric crypto imports)
+    JWT_BACKEND: Literal["jose", "hs256"] = "jose"
+    IDEMPOTENCY_TTL_SECONDS: int = 24 * 60 * 60
+    IDEMPOTENCY_MAX_ENTRIES: int = 10000
+    # Duplicates block a threadpool worker while they wait, so keep both of these small
+    IDEMPOTENCY_WAIT_TIMEOUT_SECONDS: float = 2.0
+    IDEMPOTENCY_MAX_WAITERS: int = 2
+    COMMENT_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    COMMENT_CACHE_TTL_SECONDS: float = 60.0
 
     model_config = ConfigDict(
         env_file=".env",
         extra="ignore"  # Ignore POSTGRES_* variables used by docker-compose
     )
 
+    @field_validator("READ_REPLICA_URLS", mode="before")
+    @classmethod
+    def split_replica_urls(cls, value):
+        if isinstance(value, str):
+            return [url.strip() for url in value.split(",") if url.strip()]
+        return value
+
+    @model_validator(mode="after")
+    def check_jwt_backend(self):
+        if self.JWT_BACKEND == "hs256" and self.ALGORITHM != "HS256":
+            raise ValueError(f"JWT_BACKEND=hs256 does not support ALGORITHM={self.ALGORITHM}")
+        return self
+
 settings = Settings()
@@ -1,3 +1,3 @@
-from database.database import Base, engine, get_db, SessionLocal
+from database.database import Base, engine, get_db, get_read_db, SessionLocal
 
-__all__ = ["Base", "engine", "get_db", "SessionLocal"]
+__all__ = ["Base", "engine", "get_db", "get_read_db", "SessionLocal"]
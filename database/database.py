@@ -1,14 +1,191 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from fastapi import HTTPException, Request
+from sqlalchemy import create_engine, event, make_url, text
+from sqlalchemy.exc import OperationalError, SQLAlchemyError
+from sqlalchemy.orm import sessionmaker, declarative_base, Session
 from core.config import settings
+from services.auth import verify_access_token
 
 engine = create_engine(settings.DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
-def get_db():
+# Whether the WAL receiver is streaming from the primary, and seconds of replay lag
+# (0 when everything received has been replayed). A standby cut off from the primary
+# replays what it has and then looks caught up, so the receiver status must be checked too.
+# Reading pg_stat_wal_receiver.status requires pg_read_all_stats (or pg_monitor).
+POSTGRES_REPLICA_LAG_SQL = text(
+    "SELECT "
+    "(SELECT status FROM pg_stat_wal_receiver) = 'streaming', "
+    "CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+READ_YOUR_WRITES_MAX_ENTRIES = 10000
+
+
+class Replica:
+    """
+    A read replica engine with a cached health check.
+    A replica is unhealthy if it cannot be reached, is not streaming from the primary,
+    its lag is unknown, or it lags more than max_lag seconds.
+    """
+
+    def __init__(self, url: str):
+        connect_args = {}
+        if make_url(url).get_backend_name() == "postgresql":
+            # Fail fast on an unreachable host instead of hanging the request
+            connect_args["connect_timeout"] = settings.REPLICA_CONNECT_TIMEOUT_SECONDS
+        self.engine = create_engine(url, pool_pre_ping=True, connect_args=connect_args)
+        self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.healthy = True
+        self.checked_at = float("-inf")
+        self._lock = threading.Lock()
+
+    def is_healthy(self, max_lag: float, check_interval: float) -> bool:
+        """
+        Return the last health result, re-checking at most once per check_interval.
+        Only one request runs the check; others use the previous result meanwhile.
+        """
+        if time.monotonic() - self.checked_at >= check_interval and self._lock.acquire(blocking=False):
+            try:
+                self.healthy = self._check(max_lag)
+                self.checked_at = time.monotonic()
+            finally:
+                self._lock.release()
+        return self.healthy
+
+    def mark_unhealthy(self) -> None:
+        """
+        Take the replica out of rotation until the next health check is due.
+        """
+        self.healthy = False
+        self.checked_at = time.monotonic()
+
+    def _check(self, max_lag: float) -> bool:
+        try:
+            with self.engine.connect() as conn:
+                if self.engine.dialect.name == "postgresql":
+                    streaming, lag = conn.execute(POSTGRES_REPLICA_LAG_SQL).one()
+                    return bool(streaming) and lag is not None and lag <= max_lag
+                conn.execute(text("SELECT 1"))
+                return True
+        except SQLAlchemyError:
+            return False
+
+
+class ReplicaRouter:
+    """
+    Round-robin selection across healthy replicas.
+    Returns None when there are no healthy replicas so callers fall back to the primary.
+    """
+
+    def __init__(self, urls: list[str], max_lag: float, check_interval: float):
+        self.replicas = [Replica(url) for url in urls]
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._counter = itertools.count()
+
+    def pick(self) -> Optional[Replica]:
+        if not self.replicas:
+            return None
+        start = next(self._counter)
+        for offset in range(len(self.replicas)):
+            replica = self.replicas[(start + offset) % len(self.replicas)]
+            if replica.is_healthy(self.max_lag, self.check_interval):
+                return replica
+        return None
+
+
+replica_router = ReplicaRouter(
+    settings.READ_REPLICA_URLS,
+    max_lag=settings.REPLICA_MAX_LAG_SECONDS,
+    check_interval=settings.REPLICA_HEALTH_CHECK_INTERVAL_SECONDS,
+)
+
+# Users who recently committed a write, mapped to when their stickiness to the primary ends.
+# Every window has the same length, so insertion order is also expiry order.
+_recent_writes: "OrderedDict[int, float]" = OrderedDict()
+_recent_writes_lock = threading.Lock()
+
+
+def _request_user_id(request: Request) -> Optional[int]:
+    """
+    User ID from the request's Bearer token, or None if it is missing or invalid.
+    """
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return verify_access_token(token)
+    except HTTPException:
+        return None
+
+
+def mark_recent_write(user_id: int) -> None:
+    now = time.monotonic()
+    with _recent_writes_lock:
+        _recent_writes.pop(user_id, None)
+        _recent_writes[user_id] = now + settings.READ_YOUR_WRITES_SECONDS
+        while _recent_writes:
+            oldest_until = next(iter(_recent_writes.values()))
+            if oldest_until > now and len(_recent_writes) <= READ_YOUR_WRITES_MAX_ENTRIES:
+                break
+            _recent_writes.popitem(last=False)
+
+
+def has_recent_write(user_id: Optional[int]) -> bool:
+    if user_id is None:
+        return False
+    until = _recent_writes.get(user_id)
+    return until is not None and until > time.monotonic()
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _record_commit(session: Session) -> None:
+    user_id = session.info.get("user_id")
+    if user_id is not None:
+        mark_recent_write(user_id)
+
+
+def get_db(request: Request):
     db = SessionLocal()
+    db.info["user_id"] = _request_user_id(request)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_read_db(request: Request):
+    """
+    Dependency for read-only endpoints.
+    Uses a healthy replica, or the primary if none is available, the chosen replica
+    cannot be reached, or the authenticated user committed a write within
+    READ_YOUR_WRITES_SECONDS. Write tracking is per worker process, so a write handled
+    by another worker or instance does not make this worker's reads sticky.
+    """
+    db = None
+    replica = None
+    if not has_recent_write(_request_user_id(request)):
+        replica = replica_router.pick()
+    if replica is not None:
+        db = replica.SessionLocal()
+        try:
+            # Connect now so a dead replica falls back here rather than failing the endpoint
+            db.connection()
+        except OperationalError:
+            db.close()
+            db = None
+            replica.mark_unhealthy()
+    if db is None:
+        db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
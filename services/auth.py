@@ -1,24 +1,53 @@
-from passlib.context import CryptContext
 from datetime import datetime, timedelta, timezone
-from jose import JWTError, jwt
+from functools import lru_cache
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from core.config import settings
+from services import jwt_hs256
 
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
 security = HTTPBearer()
 
+@lru_cache(maxsize=None)
+def get_pwd_context():
+    """
+    Build the passlib context on first use so passlib and argon2 are not imported at startup.
+    """
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["argon2"], deprecated="auto")
+
+@lru_cache(maxsize=None)
+def get_jwt_backend():
+    """
+    Return (encode, decode, error type) for the configured JWT_BACKEND.
+    "hs256" uses the standard-library implementation; "jose" imports python-jose on first use.
+    Settings rejects JWT_BACKEND=hs256 with any other ALGORITHM at startup.
+    """
+    if settings.JWT_BACKEND == "hs256":
+        return jwt_hs256.encode, jwt_hs256.decode, jwt_hs256.JWTError
+
+    from jose import JWTError, jwt
+
+    def encode(claims: dict, key: str) -> str:
+        return jwt.encode(claims, key, algorithm=settings.ALGORITHM)
+
+    def decode(token: str, key: str) -> dict:
+        return jwt.decode(token, key, algorithms=[settings.ALGORITHM])
+
+    return encode, decode, JWTError
+
 def hash_password(password: str):
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 def verify_password(plain, hashed):
-    return pwd_context.verify(plain, hashed)
+    return get_pwd_context().verify(plain, hashed)
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None):
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + (expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES))
     to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    encode, _, _ = get_jwt_backend()
+    return encode(to_encode, settings.SECRET_KEY)
 
 def verify_access_token(token: str) -> int:
     """
@@ -26,8 +55,9 @@ def verify_access_token(token: str) -> int:
     Returns the user ID from the token's 'sub' claim.
     Raises HTTPException if token is invalid or expired.
     """
+    _, decode, jwt_error = get_jwt_backend()
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = decode(token, settings.SECRET_KEY)
         user_id: str = payload.get("sub")
         if user_id is None:
             raise HTTPException(
@@ -36,7 +66,7 @@ def verify_access_token(token: str) -> int:
                 headers={"WWW-Authenticate": "Bearer"},
             )
         return int(user_id)
-    except JWTError:
+    except jwt_error:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token",
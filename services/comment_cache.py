@@ -0,0 +1,248 @@
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, List, Optional
+
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from database.models.comment import Comment
+from schemas.comment import CommentOut
+
+
+class CommentRecord:
+    """
+    Compact, immutable copy of the Comment columns needed to serve a page.
+    post_id is not stored; records are always held under their post.
+    """
+    __slots__ = ("id", "content", "owner_id", "parent_id", "created_at")
+
+    def __init__(
+        self,
+        id: int,
+        content: str,
+        owner_id: int,
+        parent_id: Optional[int],
+        created_at: datetime
+    ):
+        self.id = id
+        self.content = content
+        self.owner_id = owner_id
+        self.parent_id = parent_id
+        self.created_at = created_at
+
+    @classmethod
+    def from_comment(cls, comment: Comment) -> "CommentRecord":
+        return cls(
+            comment.id,
+            comment.content,
+            comment.owner_id,
+            comment.parent_id,
+            comment.created_at
+        )
+
+    def size(self) -> int:
+        """
+        Approximate bytes held by this record, including its list slot and id array entry.
+        Each row holds its own int objects for the id columns, so those are counted too.
+        """
+        return (
+            sys.getsizeof(self)
+            + sys.getsizeof(self.content)
+            + sys.getsizeof(self.created_at)
+            + sys.getsizeof(self.id)
+            + sys.getsizeof(self.owner_id)
+            + (sys.getsizeof(self.parent_id) if self.parent_id is not None else 0)
+            + 2 * 8
+        )
+
+
+class PostComments:
+    """
+    All comments of one post, sorted by id.
+    ids is a parallel array('q') so keyset lookups bisect over machine ints.
+    """
+    __slots__ = ("ids", "records", "nbytes", "loaded_at")
+
+    def __init__(self, records: List[CommentRecord]):
+        self.ids = array("q", (record.id for record in records))
+        self.records = records
+        self.nbytes = sum(record.size() for record in records)
+        self.loaded_at = time.monotonic()
+
+    def page(self, after: Optional[int], limit: int) -> List[CommentRecord]:
+        start = 0 if after is None else bisect_right(self.ids, after)
+        return self.records[start:start + limit]
+
+    def insert(self, record: CommentRecord) -> int:
+        """
+        Insert or replace a record, returning the change in bytes.
+        New comments normally have the highest id, so this is an append.
+        """
+        index = bisect_right(self.ids, record.id)
+        if index and self.ids[index - 1] == record.id:
+            delta = record.size() - self.records[index - 1].size()
+            self.records[index - 1] = record
+        else:
+            delta = record.size()
+            self.ids.insert(index, record.id)
+            self.records.insert(index, record)
+        self.nbytes += delta
+        return delta
+
+
+class CommentPageCache:
+    """
+    Per-post comment lists with LRU eviction across posts, bounded by max_bytes.
+    Entries are reloaded after ttl_seconds so writes made by other workers show up.
+    """
+
+    def __init__(self, max_bytes: int, ttl_seconds: float):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._posts: "OrderedDict[int, PostComments]" = OrderedDict()
+        # Comments added while a post is being loaded, merged in once the load finishes
+        self._pending: dict[int, List[CommentRecord]] = {}
+        self._lock = threading.Lock()
+
+    def page(
+        self,
+        post_id: int,
+        after: Optional[int],
+        limit: int,
+        load: Callable[[], List[CommentRecord]]
+    ) -> List[CommentRecord]:
+        """
+        Return up to limit comments of a post with id greater than after.
+        load is called on a miss and must return the post's comments sorted by id;
+        exceptions it raises propagate and nothing is cached.
+        """
+        with self._lock:
+            entry = self._posts.get(post_id)
+            if entry is not None and time.monotonic() - entry.loaded_at < self.ttl_seconds:
+                self._posts.move_to_end(post_id)
+                self.hits += 1
+                return entry.page(after, limit)
+            self.misses += 1
+            started_at = time.monotonic()
+            self._pending.setdefault(post_id, [])
+
+        try:
+            entry = PostComments(load())
+        except BaseException:
+            with self._lock:
+                self._pending.pop(post_id, None)
+            raise
+        with self._lock:
+            current = self._posts.get(post_id)
+            if current is not None and current.loaded_at >= started_at:
+                # A concurrent load finished first and already merged pending comments
+                return current.page(after, limit)
+            pending = self._pending.pop(post_id, None)
+            if pending is None:
+                # Invalidated while loading, so this snapshot may be stale; serve it uncached
+                return entry.page(after, limit)
+            for record in pending:
+                entry.insert(record)
+            self._store(post_id, entry)
+            return entry.page(after, limit)
+
+    def add(self, comment: Comment) -> None:
+        """
+        Add a new or edited comment to its post's cached list, if the post is cached.
+        """
+        record = CommentRecord.from_comment(comment)
+        with self._lock:
+            pending = self._pending.get(comment.post_id)
+            if pending is not None:
+                pending.append(record)
+            entry = self._posts.get(comment.post_id)
+            if entry is not None:
+                self.nbytes += entry.insert(record)
+                self._evict()
+
+    def invalidate(self, post_id: int) -> None:
+        with self._lock:
+            self._pending.pop(post_id, None)
+            entry = self._posts.pop(post_id, None)
+            if entry is not None:
+                self.nbytes -= entry.nbytes
+
+    def clear(self) -> None:
+        with self._lock:
+            self._posts.clear()
+            self._pending.clear()
+            self.nbytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            comments = sum(len(entry.records) for entry in self._posts.values())
+            return {
+                "posts": len(self._posts),
+                "comments": comments,
+                "bytes": self.nbytes,
+                "bytes_per_comment": self.nbytes / comments if comments else 0.0,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def _store(self, post_id: int, entry: PostComments) -> None:
+        """
+        Must be called with the lock held.
+        """
+        previous = self._posts.pop(post_id, None)
+        if previous is not None:
+            self.nbytes -= previous.nbytes
+        self._posts[post_id] = entry
+        self.nbytes += entry.nbytes
+        self._evict()
+
+    def _evict(self) -> None:
+        """
+        Drop least recently used posts until under max_bytes, always keeping the newest.
+        Must be called with the lock held.
+        """
+        while self.nbytes > self.max_bytes and len(self._posts) > 1:
+            _, entry = self._posts.popitem(last=False)
+            self.nbytes -= entry.nbytes
+
+
+comment_page_cache = CommentPageCache(
+    max_bytes=settings.COMMENT_CACHE_MAX_BYTES,
+    ttl_seconds=settings.COMMENT_CACHE_TTL_SECONDS,
+)
+
+
+def load_post_comments(db: Session, post_id: int) -> List[CommentRecord]:
+    """
+    Load every comment of a post, sorted by id, as compact records.
+    """
+    rows = db.query(
+        Comment.id,
+        Comment.content,
+        Comment.owner_id,
+        Comment.parent_id,
+        Comment.created_at
+    ).filter(Comment.post_id == post_id).order_by(Comment.id).all()
+    return [CommentRecord(*row) for row in rows]
+
+
+def record_to_schema(record: CommentRecord, post_id: int) -> CommentOut:
+    """
+    Convert a CommentRecord of the given post to CommentOut schema.
+    """
+    return CommentOut(
+        id=record.id,
+        content=record.content,
+        owner_id=record.owner_id,
+        post_id=post_id,
+        parent_id=record.parent_id,
+        created_at=record.created_at
+    )
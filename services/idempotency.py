@@ -0,0 +1,198 @@
+import hashlib
+import hmac
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional, TypeVar
+
+from fastapi import Header, HTTPException, status
+from pydantic import BaseModel
+
+from core.config import settings
+
+T = TypeVar("T")
+
+MAX_KEY_LENGTH = 255
+
+
+class _Entry:
+    __slots__ = ("fingerprint", "response", "completed", "expires_at", "waiters", "done")
+
+    def __init__(self, fingerprint: str, expires_at: float):
+        self.fingerprint = fingerprint
+        self.response = None
+        self.completed = False
+        self.expires_at = expires_at
+        self.waiters = 0
+        self.done = threading.Event()
+
+
+class IdempotencyStore:
+    """
+    Bounded in-process cache of responses keyed by Idempotency-Key.
+    Entries expire ttl_seconds after completing; when full, the oldest completed entries are evicted.
+    The store is per worker process, so retries are only deduplicated within one worker.
+
+    Sync endpoints run in a small shared threadpool, so at most max_waiters duplicates
+    per key block waiting for the first request, each for at most wait_timeout seconds.
+    Further duplicates get 409 immediately and can retry later.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        wait_timeout: float,
+        max_waiters: int,
+        secret_key: str
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.wait_timeout = wait_timeout
+        self.max_waiters = max_waiters
+        self._secret_key = secret_key.encode()
+        self._entries: "OrderedDict[tuple[str, str], _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def run(
+        self,
+        key: Optional[str],
+        scope: str,
+        route: str,
+        payload: BaseModel,
+        operation: Callable[[], T],
+        ttl_seconds: Optional[float] = None
+    ) -> T:
+        """
+        Run operation once per (scope, key) and replay its response for repeats.
+        scope identifies the caller; route and payload identify the request, and reusing
+        a key for a different request raises 422.
+        ttl_seconds overrides the store's TTL for this route.
+        A concurrent duplicate waits for the first request to finish.
+        Failed operations are not cached, so a later retry runs the write again.
+        """
+        if key is None:
+            return operation()
+
+        if ttl_seconds is None:
+            ttl_seconds = self.ttl_seconds
+        cache_key = (scope, key)
+        # Keyed so a payload containing a password cannot be brute-forced from memory
+        fingerprint = hmac.new(
+            self._secret_key,
+            f"{route}\n{payload.model_dump_json()}".encode(),
+            hashlib.sha256
+        ).hexdigest()
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._evict(now)
+                entry = self._entries.get(cache_key)
+                if entry is not None and entry.completed and entry.expires_at <= now:
+                    # Expired but not yet evicted, e.g. a short-TTL entry behind a longer one
+                    del self._entries[cache_key]
+                    entry = None
+                is_owner = entry is None
+                if is_owner:
+                    entry = _Entry(fingerprint, now + ttl_seconds)
+                    self._entries[cache_key] = entry
+                elif entry.fingerprint != fingerprint:
+                    raise HTTPException(
+                        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                        detail="Idempotency-Key was already used with a different request"
+                    )
+                elif entry.completed:
+                    return entry.response
+                elif entry.waiters >= self.max_waiters:
+                    raise HTTPException(
+                        status_code=status.HTTP_409_CONFLICT,
+                        detail="A request with this Idempotency-Key is still in progress"
+                    )
+                else:
+                    entry.waiters += 1
+
+            if is_owner:
+                break
+
+            try:
+                finished = entry.done.wait(self.wait_timeout)
+            finally:
+                with self._lock:
+                    entry.waiters -= 1
+            if not finished:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="A request with this Idempotency-Key is still in progress"
+                )
+            if entry.completed:
+                return entry.response
+            # The first request failed and released the key; try to take it over
+
+        try:
+            response = operation()
+        except BaseException:
+            with self._lock:
+                if self._entries.get(cache_key) is entry:
+                    del self._entries[cache_key]
+            entry.done.set()
+            raise
+
+        with self._lock:
+            entry.response = response
+            entry.completed = True
+            entry.expires_at = time.monotonic() + ttl_seconds
+            if self._entries.get(cache_key) is entry:
+                self._entries.move_to_end(cache_key)
+        entry.done.set()
+        return response
+
+    def _evict(self, now: float) -> None:
+        """
+        Drop expired completed entries, then the oldest completed ones while over capacity.
+        In-flight entries are kept so their waiters are never orphaned.
+        Must be called with the lock held.
+        """
+        overflow = len(self._entries) - self.max_entries + 1
+        stale = []
+        for cache_key, entry in self._entries.items():
+            if not entry.completed:
+                continue
+            # Completed entries are roughly in expiry order, so stop at the first live one;
+            # entries with a shorter per-route TTL that are left behind are skipped on lookup
+            if entry.expires_at > now and overflow <= 0:
+                break
+            stale.append(cache_key)
+            overflow -= 1
+        for cache_key in stale:
+            del self._entries[cache_key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+idempotency_store = IdempotencyStore(
+    max_entries=settings.IDEMPOTENCY_MAX_ENTRIES,
+    ttl_seconds=settings.IDEMPOTENCY_TTL_SECONDS,
+    wait_timeout=settings.IDEMPOTENCY_WAIT_TIMEOUT_SECONDS,
+    max_waiters=settings.IDEMPOTENCY_MAX_WAITERS,
+    secret_key=settings.SECRET_KEY,
+)
+
+
+def get_idempotency_key(
+    idempotency_key: Optional[str] = Header(default=None, alias="Idempotency-Key")
+) -> Optional[str]:
+    """
+    Dependency that reads the optional Idempotency-Key header.
+    Raises 400 if the key is empty or too long.
+    """
+    if idempotency_key is None:
+        return None
+    if not idempotency_key or len(idempotency_key) > MAX_KEY_LENGTH:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Idempotency-Key must be between 1 and {MAX_KEY_LENGTH} characters"
+        )
+    return idempotency_key
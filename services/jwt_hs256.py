@@ -0,0 +1,73 @@
+"""
+Minimal HS256-only JWT encoding and decoding using the standard library.
+Avoids importing python-jose, which pulls in the asymmetric crypto backends
+(ecdsa, rsa, pyasn1) that HS256 never uses.
+"""
+import base64
+import hashlib
+import hmac
+import json
+import time
+from datetime import datetime
+
+ALGORITHM = "HS256"
+
+_HEADER = base64.urlsafe_b64encode(
+    json.dumps({"alg": ALGORITHM, "typ": "JWT"}, separators=(",", ":")).encode()
+).rstrip(b"=")
+
+
+class JWTError(Exception):
+    pass
+
+
+def _b64encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def _b64decode(data: bytes) -> bytes:
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+
+def _sign(signing_input: bytes, key: str) -> bytes:
+    return _b64encode(hmac.new(key.encode(), signing_input, hashlib.sha256).digest())
+
+
+def encode(claims: dict, key: str) -> str:
+    """
+    Encode claims as an HS256 JWT. Datetime values become integer timestamps.
+    """
+    payload = {
+        name: int(value.timestamp()) if isinstance(value, datetime) else value
+        for name, value in claims.items()
+    }
+    signing_input = _HEADER + b"." + _b64encode(json.dumps(payload, separators=(",", ":")).encode())
+    return (signing_input + b"." + _sign(signing_input, key)).decode()
+
+
+def decode(token: str, key: str) -> dict:
+    """
+    Verify an HS256 JWT and return its claims.
+    Raises JWTError if the token is malformed, has a bad signature or has expired.
+    """
+    try:
+        signing_input, signature = token.encode().rsplit(b".", 1)
+        header_segment, payload_segment = signing_input.split(b".")
+        header = json.loads(_b64decode(header_segment))
+        if not isinstance(header, dict) or header.get("alg") != ALGORITHM:
+            raise JWTError("Unsupported algorithm")
+        if not hmac.compare_digest(signature, _sign(signing_input, key)):
+            raise JWTError("Signature verification failed")
+        payload = json.loads(_b64decode(payload_segment))
+    except (ValueError, UnicodeError) as e:
+        raise JWTError("Malformed token") from e
+
+    if not isinstance(payload, dict):
+        raise JWTError("Malformed token")
+    exp = payload.get("exp")
+    if exp is not None:
+        if not isinstance(exp, (int, float)):
+            raise JWTError("Invalid exp claim")
+        if exp <= time.time():
+            raise JWTError("Signature has expired")
+    return payload